@@ -0,0 +1,228 @@
+"""
+NOAA sunrise/sunset kernel.
+
+This is a flat, float-only port of the NOAA algorithm used by zmanim's
+NOAACalculator. Keeping it free of objects lets Numba compile it to machine
+code when it is installed (``pip install zmanim-mcp-server[speedups]``);
+without Numba the same functions run as plain Python.
+"""
+import math
+
+try:
+    from numba import njit
+except ImportError:  # Numba is an optional speedup
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit that returns the function unchanged."""
+        def decorator(func):
+            return func
+        return decorator
+
+
+JULIAN_DAY_JAN_1_2000 = 2451545.0
+JULIAN_DAYS_PER_CENTURY = 36525.0
+
+
+# Explicit signatures make Numba compile eagerly at import time, so the first
+# request does not pay the JIT cost. Compiled code is cached on disk.
+
+@njit("float64(int64, int64, int64)", cache=True, nogil=True)
+def julian_day(year, month, day):
+    """
+    Get the Julian day at 00:00 UTC of a Gregorian calendar date.
+
+    Args:
+        year: Calendar year
+        month: Calendar month (1-12)
+        day: Day of the month
+
+    Returns:
+        Julian day number
+    """
+    a = (14 - month) // 12
+    y = year + 4800 - a
+    m = month + 12 * a - 3
+    jdn = day + (153 * m + 2) // 5 + 365 * y + y // 4 - y // 100 + y // 400 - 32045
+    return jdn - 0.5
+
+
+@njit("float64(float64)", cache=True, nogil=True)
+def _julian_centuries(jd):
+    return (jd - JULIAN_DAY_JAN_1_2000) / JULIAN_DAYS_PER_CENTURY
+
+
+@njit("float64(float64)", cache=True, nogil=True)
+def _sun_geometric_mean_longitude(t):
+    return (280.46646 + t * (36000.76983 + 0.0003032 * t)) % 360  # in degrees
+
+
+@njit("float64(float64)", cache=True, nogil=True)
+def _sun_geometric_mean_anomaly(t):
+    return (357.52911 + t * (35999.05029 - 0.0001537 * t)) % 360  # in degrees
+
+
+@njit("float64(float64)", cache=True, nogil=True)
+def _earth_orbit_eccentricity(t):
+    return 0.016708634 - t * (0.000042037 + 0.0000001267 * t)  # unitless
+
+
+@njit("float64(float64)", cache=True, nogil=True)
+def _obliquity_correction(t):
+    seconds = 21.448 - t * (46.8150 + t * (0.00059 - t * 0.001813))
+    mean_obliquity = 23.0 + (26.0 + seconds / 60) / 60.0
+    omega = 125.04 - 1934.136 * t
+    return (mean_obliquity + 0.00256 * math.cos(math.radians(omega))) % 360  # in degrees
+
+
+@njit("float64(float64)", cache=True, nogil=True)
+def _equation_of_time(t):
+    epsilon = math.radians(_obliquity_correction(t))
+    sgml = math.radians(_sun_geometric_mean_longitude(t))
+    sgma = math.radians(_sun_geometric_mean_anomaly(t))
+    eoe = _earth_orbit_eccentricity(t)
+
+    y = math.tan(epsilon / 2.0)
+    y *= y
+
+    sinm = math.sin(sgma)
+    eq_time = (y * math.sin(2.0 * sgml)) - (2.0 * eoe * sinm) + \
+              (4.0 * eoe * y * sinm * math.cos(2.0 * sgml)) - \
+              (0.5 * y * y * math.sin(4.0 * sgml)) - (1.25 * eoe * eoe * math.sin(2.0 * sgma))
+    return math.degrees(eq_time) * 4.0  # minutes of time
+
+
+@njit("float64(float64)", cache=True, nogil=True)
+def _solar_declination(t):
+    mrad = math.radians(_sun_geometric_mean_anomaly(t))
+    center = (math.sin(mrad) * (1.914602 - t * (0.004817 + 0.000014 * t))) + \
+             (math.sin(2 * mrad) * (0.019993 - 0.000101 * t)) + \
+             (math.sin(3 * mrad) * 0.000289)
+    omega = 125.04 - 1934.136 * t
+    apparent_longitude = _sun_geometric_mean_longitude(t) + center - 0.00569 - \
+        0.00478 * math.sin(math.radians(omega))
+    sint = math.sin(math.radians(_obliquity_correction(t))) * math.sin(math.radians(apparent_longitude))
+    return math.degrees(math.asin(sint))  # in degrees
+
+
+@njit("float64(float64, float64)", cache=True, nogil=True)
+def solar_noon_utc(jd, longitude):
+    """
+    Get the time of solar noon.
+
+    Args:
+        jd: Julian day at 00:00 UTC of the date
+        longitude: Longitude in decimal degrees, positive east of Greenwich
+
+    Returns:
+        Minutes after 00:00 UTC
+    """
+    west = -longitude
+
+    # first pass to yield approximate solar noon
+    approx_eq_time = _equation_of_time(_julian_centuries(jd + west / 360.0))
+    approx_sol_noon = 720 + west * 4 - approx_eq_time
+
+    # refinement using output of first pass
+    eq_time = _equation_of_time(_julian_centuries(jd - 0.5 + approx_sol_noon / 1440.0))
+    return 720 + west * 4 - eq_time
+
+
+@njit("float64(float64, float64, float64, float64, float64)", cache=True, nogil=True)
+def _approximate_utc_sun_position(t, lat_r, west, cos_zenith, direction):
+    eq_time = _equation_of_time(t)
+    solar_dec_r = math.radians(_solar_declination(t))
+
+    cos_hour_angle = (cos_zenith / (math.cos(lat_r) * math.cos(solar_dec_r))) - \
+                     (math.tan(lat_r) * math.tan(solar_dec_r))
+    if cos_hour_angle < -1.0 or cos_hour_angle > 1.0:
+        return math.nan  # the sun never crosses this zenith on this day
+    hour_angle = math.acos(cos_hour_angle) * direction
+
+    return 720 + (west - math.degrees(hour_angle)) * 4.0 - eq_time
+
+
+@njit("float64(float64, float64, float64, float64, float64, float64)", cache=True, nogil=True)
+def _utc_sun_position(jd, tnoon, lat_r, west, cos_zenith, direction):
+    # first pass using solar noon
+    first_pass = _approximate_utc_sun_position(tnoon, lat_r, west, cos_zenith, direction)
+    if math.isnan(first_pass):
+        return math.nan
+
+    # refine using output of first pass
+    trefinement = _julian_centuries(jd + first_pass / 1440.0)
+    utc_time = _approximate_utc_sun_position(trefinement, lat_r, west, cos_zenith, direction)
+    return (utc_time / 60.0) % 24  # normalized (0...24)
+
+
+@njit("UniTuple(float64, 2)(float64, float64, float64, float64)", cache=True, nogil=True)
+def sun_rise_set_utc(jd, latitude, longitude, zenith):
+    """
+    Get the times the sun crosses the given zenith in the morning and evening.
+
+    Both passes share a single solar noon calculation.
+
+    Args:
+        jd: Julian day at 00:00 UTC of the date
+        latitude: Latitude in decimal degrees
+        longitude: Longitude in decimal degrees, positive east of Greenwich
+        zenith: Zenith angle in degrees (already adjusted for refraction)
+
+    Returns:
+        (sunrise, sunset) in hours after 00:00 UTC (0-24), NaN where the sun
+        does not cross the zenith
+    """
+    # Invariants shared by all four passes
+    tnoon = _julian_centuries(jd + solar_noon_utc(jd, longitude) / 1440.0)
+    lat_r = math.radians(latitude)
+    cos_zenith = math.cos(math.radians(zenith))
+
+    return (_utc_sun_position(jd, tnoon, lat_r, -longitude, cos_zenith, 1.0),
+            _utc_sun_position(jd, tnoon, lat_r, -longitude, cos_zenith, -1.0))
+
+
+# Mean tropical year and the Julian day of 2000-01-01 00:00 UTC, used to turn
+# a Julian day into the fractional-year angle of Spencer's series
+TROPICAL_YEAR_DAYS = 365.2422
+JULIAN_DAY_JAN_1_2000_MIDNIGHT = 2451544.5
+
+
+# No signature here: this kernel is opt-in, so it compiles on first use rather
+# than at import time.
+@njit(cache=True, nogil=True)
+def ephemeris_sun_rise_set_utc(jd, latitude, longitude, zenith):
+    """
+    Approximate sun_rise_set_utc with Spencer's Fourier series.
+
+    The equation of time and declination are each a handful of sine/cosine
+    terms evaluated once, at local solar noon, instead of NOAA's iterated
+    polynomial solution. Compared with NOAA, results are within about a
+    minute below 50 degrees latitude, up to about 1.5 minutes between 50 and
+    60 degrees, and up to about 11 minutes between 60 and 66 degrees.
+
+    Args:
+        jd: Julian day at 00:00 UTC of the date
+        latitude: Latitude in decimal degrees
+        longitude: Longitude in decimal degrees, positive east of Greenwich
+        zenith: Zenith angle in degrees (already adjusted for refraction)
+
+    Returns:
+        (sunrise, sunset) in hours after 00:00 UTC (0-24), NaN where the sun
+        does not cross the zenith
+    """
+    days = jd - JULIAN_DAY_JAN_1_2000_MIDNIGHT + 0.5 - longitude / 360.0
+    gamma = 2.0 * math.pi * (days % TROPICAL_YEAR_DAYS) / TROPICAL_YEAR_DAYS
+
+    eq_time = 229.18 * (0.000075 + 0.001868 * math.cos(gamma) - 0.032077 * math.sin(gamma) -
+                        0.014615 * math.cos(2 * gamma) - 0.040849 * math.sin(2 * gamma))  # minutes
+    solar_dec_r = 0.006918 - 0.399912 * math.cos(gamma) + 0.070257 * math.sin(gamma) - \
+        0.006758 * math.cos(2 * gamma) + 0.000907 * math.sin(2 * gamma) - \
+        0.002697 * math.cos(3 * gamma) + 0.00148 * math.sin(3 * gamma)  # radians
+
+    lat_r = math.radians(latitude)
+    cos_hour_angle = (math.cos(math.radians(zenith)) / (math.cos(lat_r) * math.cos(solar_dec_r))) - \
+                     (math.tan(lat_r) * math.tan(solar_dec_r))
+    if cos_hour_angle < -1.0 or cos_hour_angle > 1.0:
+        return math.nan, math.nan  # the sun never crosses this zenith on this day
+    hour_angle = math.degrees(math.acos(cos_hour_angle))
+
+    noon = 720 - 4.0 * longitude - eq_time
+    return ((noon - 4.0 * hour_angle) / 60.0) % 24, ((noon + 4.0 * hour_angle) / 60.0) % 24
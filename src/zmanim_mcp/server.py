@@ -1,17 +1,42 @@
 from typing import Any, Optional
+import asyncio
+from dataclasses import dataclass
 import datetime
+import functools
+import json
+import math
 from enum import Enum
+import string
+import threading
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 from mcp.server.fastmcp import FastMCP
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, field_validator
 import zmanim
 from zmanim.zmanim_calendar import ZmanimCalendar
 from zmanim.util.geo_location import GeoLocation
+from zmanim_mcp import _solar
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup
+    orjson = None
 
 
 # Initialize FastMCP server
 mcp = FastMCP("zmanim_mcp")
 
 
+# Geometric zenith adjusted for refraction (34') and the solar radius (16'),
+# matching zmanim's sea-level sunrise and sunset
+SEA_LEVEL_ZENITH = 90 + (34 + 16) / 60.0
+
+# Use Spencer's Fourier-series approximation instead of the NOAA algorithm
+# for sunrise and sunset. It is several times cheaper, but drifts from NOAA
+# by about a minute at mid latitudes and by up to about 11 minutes near the
+# polar circles, so it is off by default.
+_FAST_SOLAR = False
+
+
 class ResponseFormat(str, Enum):
     """Output format for tool responses."""
     MARKDOWN = "markdown"
@@ -39,20 +64,290 @@ def create_calendar(location: str, latitude: float, longitude: float,
     Returns:
         Configured ZmanimCalendar instance
     """
-    geo_location = GeoLocation(
-        name=location,
-        latitude=latitude,
-        longitude=longitude,
-        time_zone=time_zone,
+    return ZmanimCalendar(
+        candle_lighting_offset=candle_lighting_offset,
+        geo_location=_get_geo(location, latitude, longitude, time_zone),
+        date=date or datetime.date.today()
     )
+
+
+_TZ_CACHE: dict[str, ZoneInfo] = {}
+
+
+def _tz(name: str) -> ZoneInfo:
+    """
+    Look up an IANA timezone, caching the ZoneInfo instance.
     
-    calendar = ZmanimCalendar(
-        candle_lighting_offset=candle_lighting_offset,
-        geo_location=geo_location,
-        date=date
+    Args:
+        name: IANA timezone identifier (e.g., 'America/New_York')
+        
+    Returns:
+        The shared ZoneInfo for that timezone
+        
+    Raises:
+        ValueError: If the timezone is not known
+    """
+    zone_info = _TZ_CACHE.get(name)
+    if zone_info is None:
+        try:
+            zone_info = ZoneInfo(name)
+        except (ZoneInfoNotFoundError, ValueError):
+            raise ValueError(f"Unknown time zone: {name!r}") from None
+        _TZ_CACHE[name] = zone_info
+    return zone_info
+
+
+class _ZonedGeoLocation(GeoLocation):
+    """
+    GeoLocation that also carries the inputs of the sunrise/sunset kernel.
+    
+    These depend only on the location, so they are computed once here rather
+    than through GeoLocation's validated properties on every calculation.
+    """
+    
+    def __init__(self, name: str, latitude: float, longitude: float, time_zone: str):
+        # GeoLocation only accepts a string or a dateutil tzfile, so it keeps
+        # its own copy; results are converted with the (C-accelerated) ZoneInfo.
+        # Unlike the tzfile, ZoneInfo keeps applying the zone's DST rule past
+        # the last transition in the zone file (2037), so later dates get DST
+        self.zone_info = _tz(time_zone)
+        super().__init__(name=name, latitude=latitude, longitude=longitude, time_zone=time_zone)
+        self.latitude_deg = self.latitude
+        self.longitude_deg = self.longitude
+        # Days to shift the date by near the antimeridian, and the local solar
+        # offset from UTC in hours (used to detect a UTC date wraparound)
+        self.day_adjustment = datetime.timedelta(days=self.antimeridian_adjustment())
+        self.solar_offset_hours = self.longitude / 15.0
+
+
+@functools.lru_cache(maxsize=256)
+def _get_geo(location: str, latitude: float, longitude: float, time_zone: str) -> _ZonedGeoLocation:
+    """
+    Build the GeoLocation for a location (memoized).
+    
+    Shared by every calendar for that location, so the timezone lookup only
+    happens the first time a location is seen. Callers must not mutate it.
+    """
+    return _ZonedGeoLocation(location, latitude, longitude, time_zone)
+
+
+def _fast_sun_times(calendar: ZmanimCalendar) -> tuple[Optional[datetime.datetime], Optional[datetime.datetime]]:
+    """
+    Calculate sea-level sunrise and sunset with the compiled NOAA kernel.
+    
+    Mirrors zmanim's own sunrise()/sunset(), including the antimeridian date
+    adjustment and the UTC wraparound correction.
+    
+    Args:
+        calendar: Calendar returned by create_calendar
+        
+    Returns:
+        (sunrise, sunset) as timezone-aware datetimes, each None if the sun
+        does not rise or set that day
+    """
+    geo_location = calendar.geo_location
+    date = calendar.date + geo_location.day_adjustment
+    jd = _solar.julian_day(date.year, date.month, date.day)
+    kernel = _solar.ephemeris_sun_rise_set_utc if _FAST_SOLAR else _solar.sun_rise_set_utc
+    sunrise_hours, sunset_hours = kernel(
+        jd, geo_location.latitude_deg, geo_location.longitude_deg, SEA_LEVEL_ZENITH
+    )
+    
+    midnight = datetime.datetime(date.year, date.month, date.day, tzinfo=datetime.timezone.utc)
+    local_offset = geo_location.solar_offset_hours
+    
+    sunrise = None
+    if not math.isnan(sunrise_hours):
+        sunrise = midnight + datetime.timedelta(hours=sunrise_hours)
+        # sunrise after 6pm local time means the UTC date is a day earlier
+        if math.floor(sunrise_hours) + local_offset > 18:
+            sunrise -= datetime.timedelta(days=1)
+        sunrise = sunrise.astimezone(geo_location.zone_info)
+    
+    sunset = None
+    if not math.isnan(sunset_hours):
+        sunset = midnight + datetime.timedelta(hours=sunset_hours)
+        # sunset before 6am local time means the UTC date is a day later
+        if math.floor(sunset_hours) + local_offset < 6:
+            sunset += datetime.timedelta(days=1)
+        sunset = sunset.astimezone(geo_location.zone_info)
+    
+    return sunrise, sunset
+
+
+def _offset_minutes(dt: Optional[datetime.datetime], minutes: float) -> Optional[datetime.datetime]:
+    """Shift a datetime by a number of minutes, passing None through."""
+    if dt is None:
+        return None
+    return dt + datetime.timedelta(minutes=minutes)
+
+
+@dataclass(slots=True, frozen=True)
+class ZmanimBundle:
+    """All zmanim used by the tools for one location and date (None where a time does not occur)."""
+    alos_72: Optional[datetime.datetime]
+    sunrise: Optional[datetime.datetime]
+    sof_zman_shma_gra: Optional[datetime.datetime]
+    sof_zman_shma_mga: Optional[datetime.datetime]
+    sof_zman_tfila_gra: Optional[datetime.datetime]
+    sof_zman_tfila_mga: Optional[datetime.datetime]
+    chatzos: Optional[datetime.datetime]
+    mincha_gedola: Optional[datetime.datetime]
+    mincha_ketana: Optional[datetime.datetime]
+    plag_hamincha: Optional[datetime.datetime]
+    candle_lighting: Optional[datetime.datetime]
+    sunset: Optional[datetime.datetime]
+    tzais_72: Optional[datetime.datetime]
+
+
+def compute_day_bundle(calendar: ZmanimCalendar) -> ZmanimBundle:
+    """
+    Compute every zman used by the tools for a calendar in one pass.
+    
+    Sunrise and sunset are calculated exactly once; every other zman is
+    derived from them and the GR"A / MG"A temporal hours (sha'os zmaniyos)
+    by plain arithmetic.
+    
+    Args:
+        calendar: Calendar returned by create_calendar
+        
+    Returns:
+        ZmanimBundle holding the day's times
+    """
+    sunrise, sunset = _fast_sun_times(calendar)
+    alos = _offset_minutes(sunrise, -72)
+    tzais = _offset_minutes(sunset, 72)
+    candle_lighting = _offset_minutes(sunset, -calendar.candle_lighting_offset)
+    
+    shema_gra = shema_mga = tefila_gra = tefila_mga = None
+    chatzos = mincha_gedola = mincha_ketana = plag_hamincha = None
+    if sunrise is not None and sunset is not None:
+        sha_zmanis_gra = (sunset - sunrise) / 12
+        sha_zmanis_mga = (tzais - alos) / 12
+        shema_gra = sunrise + 3 * sha_zmanis_gra
+        shema_mga = alos + 3 * sha_zmanis_mga
+        tefila_gra = sunrise + 4 * sha_zmanis_gra
+        tefila_mga = alos + 4 * sha_zmanis_mga
+        chatzos = sunrise + 6 * sha_zmanis_gra
+        mincha_gedola = chatzos + sha_zmanis_gra / 2
+        mincha_ketana = sunset - 2.5 * sha_zmanis_gra
+        plag_hamincha = sunset - 1.25 * sha_zmanis_gra
+    
+    return ZmanimBundle(
+        alos, sunrise, shema_gra, shema_mga, tefila_gra, tefila_mga, chatzos,
+        mincha_gedola, mincha_ketana, plag_hamincha, candle_lighting, sunset, tzais
     )
+
+
+_BUNDLE_CACHE_SIZE = 512
+_thread_local = threading.local()
+
+
+def _get_day_bundle(location: str, latitude: float, longitude: float,
+                    time_zone: str, date: datetime.date,
+                    candle_lighting_offset: int) -> ZmanimBundle:
+    """
+    Get the ZmanimBundle for a location and date (memoized per thread).
+    
+    Tools run in worker threads, and each thread keeps its own cache keyed on
+    the request values, so a repeated query never touches shared state or a
+    lock. Once a thread holds _BUNDLE_CACHE_SIZE bundles, its oldest entry is
+    evicted.
+    """
+    cache = getattr(_thread_local, "bundles", None)
+    if cache is None:
+        cache = _thread_local.bundles = {}
     
-    return calendar
+    key = (location, latitude, longitude, time_zone, date, candle_lighting_offset)
+    bundle = cache.get(key)
+    if bundle is None:
+        bundle = cache[key] = compute_day_bundle(create_calendar(
+            location, latitude, longitude, time_zone, date, candle_lighting_offset
+        ))
+        if len(cache) > _BUNDLE_CACHE_SIZE:
+            del cache[next(iter(cache))]
+    return bundle
+
+
+def _iso_default(obj: Any) -> str:
+    """Serialize dates and datetimes that the JSON encoder cannot handle natively."""
+    if isinstance(obj, (datetime.date, datetime.datetime)):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+_json_encoder = json.JSONEncoder(indent=2, ensure_ascii=False, default=_iso_default)
+
+
+def _dumps(payload: dict[str, Any]) -> str:
+    """
+    Serialize a tool response payload to indented JSON.
+    
+    Dates and datetimes may be placed in the payload as-is; they are emitted
+    as ISO 8601 strings, and None becomes null. Non-ASCII text is written
+    as-is rather than escaped. Uses orjson when installed; both paths produce
+    the same output.
+    
+    Args:
+        payload: Response payload
+        
+    Returns:
+        JSON string indented by two spaces
+    """
+    if orjson is not None:
+        # Hand datetimes to _iso_default: orjson's native encoding rounds UTC
+        # offsets to whole minutes, which shifts LMT-era times
+        return orjson.dumps(
+            payload,
+            default=_iso_default,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_PASSTHROUGH_DATETIME
+        ).decode()
+    return _json_encoder.encode(payload)
+
+
+_MONTHS = (
+    "", "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December",
+)
+
+
+@functools.lru_cache(maxsize=1440)
+def _clock_str(hour: int, minute: int) -> str:
+    """Format a wall-clock hour and minute as "HH:MM AM/PM" (memoized)."""
+    # Plain arithmetic rather than strftime("%I:%M %p"), which goes through
+    # the C library and the current locale
+    return f"{hour % 12 or 12:02d}:{minute:02d} {'AM' if hour < 12 else 'PM'}"
+
+
+@functools.lru_cache(maxsize=4096)
+def _stamp_str(year: int, month: int, day: int, hour: int, minute: int) -> str:
+    """Format wall-clock date and time fields as "YYYY-MM-DD HH:MM AM/PM" (memoized)."""
+    return f"{year:04d}-{month:02d}-{day:02d} {_clock_str(hour, minute)}"
+
+
+@functools.lru_cache(maxsize=512)
+def _long_date_str(d: datetime.date) -> str:
+    """Format a date as e.g. "January 05, 2024" without going through strftime."""
+    return f"{_MONTHS[d.month]} {d.day:02d}, {d.year}"
+
+
+def _emit(fields: dict[str, Optional[datetime.datetime]]) -> dict[str, Any]:
+    """
+    Build the JSON entries for a set of named times.
+    
+    Every time is emitted twice: formatted for display under its own name,
+    and as the raw datetime (serialized to ISO 8601 by _dumps) under the
+    name with an "_iso" suffix.
+    
+    Args:
+        fields: Mapping of JSON key to time (None where the time does not occur)
+        
+    Returns:
+        Payload entries with all formatted keys followed by all "_iso" keys
+    """
+    entries = {name: format_time_with_date(dt) for name, dt in fields.items()}
+    entries.update({f"{name}_iso": dt for name, dt in fields.items()})
+    return entries
 
 
 def format_time(dt: Optional[datetime.datetime]) -> str:
@@ -67,7 +362,9 @@ def format_time(dt: Optional[datetime.datetime]) -> str:
     """
     if dt is None:
         return "N/A"
-    return dt.strftime("%I:%M %p")
+    # Cache on the wall-clock fields: aware datetimes compare (and hash) by
+    # UTC instant, so keying on dt itself could mix up timezones
+    return _clock_str(dt.hour, dt.minute)
 
 
 def format_time_with_date(dt: Optional[datetime.datetime]) -> str:
@@ -82,7 +379,7 @@ def format_time_with_date(dt: Optional[datetime.datetime]) -> str:
     """
     if dt is None:
         return "N/A"
-    return dt.strftime("%Y-%m-%d %I:%M %p")
+    return _stamp_str(dt.year, dt.month, dt.day, dt.hour, dt.minute)
 
 
 # ============================================================================
@@ -93,8 +390,8 @@ class LocationInput(BaseModel):
     """Base input model for location-based zmanim queries."""
     model_config = ConfigDict(
         str_strip_whitespace=True,
-        validate_assignment=True,
-        extra='forbid'
+        extra='forbid',
+        frozen=True
     )
     
     location: str = Field(
@@ -120,14 +417,32 @@ class LocationInput(BaseModel):
         description="IANA timezone identifier (e.g., 'America/New_York', 'Asia/Jerusalem', 'Europe/London')",
         min_length=1
     )
-    date: Optional[str] = Field(
+    date: Optional[datetime.date] = Field(
         default=None,
-        description="Optional date for calculations in YYYY-MM-DD format (defaults to today if not provided)"
+        description="Optional date for calculations in YYYY-MM-DD format (defaults to today if not provided)",
+        examples=["2024-01-15"],
+        strict=True
     )
     response_format: ResponseFormat = Field(
         default=ResponseFormat.MARKDOWN,
         description="Output format: 'markdown' for human-readable or 'json' for machine-readable"
     )
+    
+    @field_validator("date", mode="before")
+    @classmethod
+    def parse_date(cls, value: Any) -> Any:
+        """Parse a YYYY-MM-DD string, treating an empty string as no date."""
+        if isinstance(value, str):
+            value = value.strip()
+            if not value:
+                return None
+            return datetime.datetime.strptime(value, "%Y-%m-%d").date()
+        return value
+    
+    @property
+    def is_json(self) -> bool:
+        """Whether the response should be JSON rather than markdown."""
+        return self.response_format is ResponseFormat.JSON
 
 
 class CandleLightingInput(LocationInput):
@@ -140,10 +455,167 @@ class CandleLightingInput(LocationInput):
     )
 
 
+# ============================================================================
+# Markdown Templates
+# ============================================================================
+
+_SUNRISE_SUNSET_TEMPLATE = string.Template("""# Sunrise and Sunset Times
+
+**Location:** $location  
+**Date:** $date  
+**Timezone:** $timezone
+
+- **Sunrise:** $sunrise
+- **Sunset:** $sunset
+""")
+
+_SHEMA_TEMPLATE = string.Template("""# Latest Times for Shema
+
+**Location:** $location  
+**Date:** $date  
+**Timezone:** $timezone
+
+## Opinions:
+
+- **GR"A (Vilna Gaon):** $shema_gra
+- **MG"A (Magen Avraham):** $shema_mga
+
+*Note: The MG"A time is typically earlier and is the more stringent opinion.*
+""")
+
+_TEFILA_TEMPLATE = string.Template("""# Latest Times for Morning Prayer (Tefila)
+
+**Location:** $location  
+**Date:** $date  
+**Timezone:** $timezone
+
+## Opinions:
+
+- **GR"A (Vilna Gaon):** $tefila_gra
+- **MG"A (Magen Avraham):** $tefila_mga
+
+*Note: The MG"A time is typically earlier.*
+""")
+
+_MINCHA_TEMPLATE = string.Template("""# Mincha (Afternoon Prayer) Times
+
+**Location:** $location  
+**Date:** $date  
+**Timezone:** $timezone
+
+## Times:
+
+- **Chatzos (Midday):** $chatzos
+- **Mincha Gedola (Earliest):** $mincha_gedola
+- **Mincha Ketana (Preferred):** $mincha_ketana
+- **Plag HaMincha:** $plag_hamincha
+
+*Note: Mincha can be prayed from Mincha Gedola until sunset, with Mincha Ketana being the preferred earliest time.*
+""")
+
+_SHABBAT_TEMPLATE = string.Template("""# Shabbat Times
+
+**Location:** $location  
+**Date:** $date  
+**Timezone:** $timezone
+
+## Friday Evening:
+
+- **Candle Lighting:** $candle_lighting ($candle_lighting_offset minutes before sunset)
+- **Sunset (Shabbat Begins):** $sunset
+
+## Saturday Evening:
+
+- **Havdalah (Tzeis HaKochavim):** $tzeis (72 minutes after sunset)
+- **Shabbat Ends:** $tzeis
+
+*Note: Candle lighting customs vary by community. Jerusalem uses 40 minutes before sunset.*
+""")
+
+_DAILY_TEMPLATE = string.Template("""# Daily Zmanim
+
+**Location:** $location  
+**Date:** $date  
+**Timezone:** $timezone
+
+## Morning Times:
+
+- **Alos HaShachar (Dawn):** $alos (72 minutes before sunrise)
+- **Sunrise:** $sunrise
+- **Latest Shema (GR"A):** $shema_gra
+- **Latest Shema (MG"A):** $shema_mga
+- **Latest Tefila (GR"A):** $tefila_gra
+- **Latest Tefila (MG"A):** $tefila_mga
+
+## Afternoon Times:
+
+- **Chatzos (Midday):** $chatzos
+- **Mincha Gedola:** $mincha_gedola
+- **Mincha Ketana:** $mincha_ketana
+- **Plag HaMincha:** $plag_hamincha
+
+## Evening Times:
+
+- **Sunset:** $sunset
+- **Tzeis HaKochavim (Nightfall):** $tzeis (72 minutes after sunset)
+""")
+
+
 # ============================================================================
 # Tool Implementations
 # ============================================================================
 
+def _load_day(params: LocationInput, candle_lighting_offset: int = 18) -> tuple[datetime.date, ZmanimBundle]:
+    """
+    Resolve the requested date and compute its zmanim.
+    
+    Args:
+        params: Tool input parameters
+        candle_lighting_offset: Minutes before sunset for candle lighting (default 18)
+        
+    Returns:
+        The date (today if none was given) and its ZmanimBundle
+    """
+    date = params.date or datetime.date.today()
+    return date, _get_day_bundle(
+        params.location,
+        params.latitude,
+        params.longitude,
+        params.time_zone,
+        date,
+        candle_lighting_offset
+    )
+
+
+def _sunrise_sunset_json(params: LocationInput) -> str:
+    """JSON body of get_sunrise_sunset."""
+    date, times = _load_day(params)
+    return _dumps({
+        "location": params.location,
+        "date": date,
+        "timezone": params.time_zone,
+        **_emit({
+            "sunrise": times.sunrise,
+            "sunset": times.sunset
+        })
+    })
+
+
+def _sunrise_sunset_markdown(params: LocationInput) -> str:
+    """Markdown body of get_sunrise_sunset."""
+    date, times = _load_day(params)
+    return _SUNRISE_SUNSET_TEMPLATE.substitute(
+        location=params.location,
+        date=_long_date_str(date),
+        timezone=params.time_zone,
+        sunrise=format_time(times.sunrise),
+        sunset=format_time(times.sunset)
+    )
+
+
+_SUNRISE_SUNSET_DISPATCH = {True: _sunrise_sunset_json, False: _sunrise_sunset_markdown}
+
+
 @mcp.tool(
     name="zmanim_get_sunrise_sunset",
     annotations={
@@ -168,7 +640,7 @@ async def get_sunrise_sunset(params: LocationInput) -> str:
             - latitude (float): Latitude in decimal degrees (-90 to 90)
             - longitude (float): Longitude in decimal degrees (-180 to 180)
             - time_zone (str): IANA timezone identifier
-            - date (Optional[str]): Date in YYYY-MM-DD format (defaults to today)
+            - date (Optional[datetime.date]): Date in YYYY-MM-DD format (defaults to today)
             - response_format (ResponseFormat): 'markdown' or 'json'
     
     Returns:
@@ -177,47 +649,36 @@ async def get_sunrise_sunset(params: LocationInput) -> str:
     Example:
         For New York on a winter day, sunrise might be at 7:15 AM and sunset at 4:30 PM.
     """
-    # Parse date if provided
-    date = None
-    if params.date:
-        date = datetime.datetime.strptime(params.date, "%Y-%m-%d").date()
-    
-    # Create calendar
-    calendar = create_calendar(
-        params.location,
-        params.latitude,
-        params.longitude,
-        params.time_zone,
-        date
+    return await asyncio.to_thread(_SUNRISE_SUNSET_DISPATCH[params.is_json], params)
+
+
+def _shema_times_json(params: LocationInput) -> str:
+    """JSON body of get_shema_times."""
+    date, times = _load_day(params)
+    return _dumps({
+        "location": params.location,
+        "date": date,
+        "timezone": params.time_zone,
+        **_emit({
+            "sof_zman_shema_gra": times.sof_zman_shma_gra,
+            "sof_zman_shema_mga": times.sof_zman_shma_mga
+        })
+    })
+
+
+def _shema_times_markdown(params: LocationInput) -> str:
+    """Markdown body of get_shema_times."""
+    date, times = _load_day(params)
+    return _SHEMA_TEMPLATE.substitute(
+        location=params.location,
+        date=_long_date_str(date),
+        timezone=params.time_zone,
+        shema_gra=format_time(times.sof_zman_shma_gra),
+        shema_mga=format_time(times.sof_zman_shma_mga)
     )
-    
-    # Get times
-    sunrise = calendar.sunrise()
-    sunset = calendar.sunset()
-    
-    if params.response_format == ResponseFormat.JSON:
-        import json
-        return json.dumps({
-            "location": params.location,
-            "date": (date or datetime.date.today()).isoformat(),
-            "timezone": params.time_zone,
-            "sunrise": format_time_with_date(sunrise),
-            "sunset": format_time_with_date(sunset),
-            "sunrise_iso": sunrise.isoformat() if sunrise else None,
-            "sunset_iso": sunset.isoformat() if sunset else None
-        }, indent=2)
-    
-    # Markdown format
-    date_str = (date or datetime.date.today()).strftime("%B %d, %Y")
-    return f"""# Sunrise and Sunset Times
 
-**Location:** {params.location}  
-**Date:** {date_str}  
-**Timezone:** {params.time_zone}
 
-- **Sunrise:** {format_time(sunrise)}
-- **Sunset:** {format_time(sunset)}
-"""
+_SHEMA_TIMES_DISPATCH = {True: _shema_times_json, False: _shema_times_markdown}
 
 
 @mcp.tool(
@@ -248,48 +709,36 @@ async def get_shema_times(params: LocationInput) -> str:
     Note:
         The MG"A time is typically earlier and more stringent than the GR"A time.
     """
-    date = None
-    if params.date:
-        date = datetime.datetime.strptime(params.date, "%Y-%m-%d").date()
-    
-    calendar = create_calendar(
-        params.location,
-        params.latitude,
-        params.longitude,
-        params.time_zone,
-        date
+    return await asyncio.to_thread(_SHEMA_TIMES_DISPATCH[params.is_json], params)
+
+
+def _tefila_times_json(params: LocationInput) -> str:
+    """JSON body of get_tefila_times."""
+    date, times = _load_day(params)
+    return _dumps({
+        "location": params.location,
+        "date": date,
+        "timezone": params.time_zone,
+        **_emit({
+            "sof_zman_tefila_gra": times.sof_zman_tfila_gra,
+            "sof_zman_tefila_mga": times.sof_zman_tfila_mga
+        })
+    })
+
+
+def _tefila_times_markdown(params: LocationInput) -> str:
+    """Markdown body of get_tefila_times."""
+    date, times = _load_day(params)
+    return _TEFILA_TEMPLATE.substitute(
+        location=params.location,
+        date=_long_date_str(date),
+        timezone=params.time_zone,
+        tefila_gra=format_time(times.sof_zman_tfila_gra),
+        tefila_mga=format_time(times.sof_zman_tfila_mga)
     )
-    
-    # Get times according to different opinions
-    shema_gra = calendar.sof_zman_shma_gra()
-    shema_mga = calendar.sof_zman_shma_mga()
-    
-    if params.response_format == ResponseFormat.JSON:
-        import json
-        return json.dumps({
-            "location": params.location,
-            "date": (date or datetime.date.today()).isoformat(),
-            "timezone": params.time_zone,
-            "sof_zman_shema_gra": format_time_with_date(shema_gra),
-            "sof_zman_shema_mga": format_time_with_date(shema_mga),
-            "sof_zman_shema_gra_iso": shema_gra.isoformat() if shema_gra else None,
-            "sof_zman_shema_mga_iso": shema_mga.isoformat() if shema_mga else None
-        }, indent=2)
-    
-    date_str = (date or datetime.date.today()).strftime("%B %d, %Y")
-    return f"""# Latest Times for Shema
-
-**Location:** {params.location}  
-**Date:** {date_str}  
-**Timezone:** {params.time_zone}
 
-## Opinions:
 
-- **GR"A (Vilna Gaon):** {format_time(shema_gra)}
-- **MG"A (Magen Avraham):** {format_time(shema_mga)}
-
-*Note: The MG"A time is typically earlier and is the more stringent opinion.*
-"""
+_TEFILA_TIMES_DISPATCH = {True: _tefila_times_json, False: _tefila_times_markdown}
 
 
 @mcp.tool(
@@ -316,47 +765,40 @@ async def get_tefila_times(params: LocationInput) -> str:
     Returns:
         str: Latest times for Tefila according to both opinions in the requested format
     """
-    date = None
-    if params.date:
-        date = datetime.datetime.strptime(params.date, "%Y-%m-%d").date()
-    
-    calendar = create_calendar(
-        params.location,
-        params.latitude,
-        params.longitude,
-        params.time_zone,
-        date
+    return await asyncio.to_thread(_TEFILA_TIMES_DISPATCH[params.is_json], params)
+
+
+def _mincha_times_json(params: LocationInput) -> str:
+    """JSON body of get_mincha_times."""
+    date, times = _load_day(params)
+    return _dumps({
+        "location": params.location,
+        "date": date,
+        "timezone": params.time_zone,
+        **_emit({
+            "chatzos": times.chatzos,
+            "mincha_gedola": times.mincha_gedola,
+            "mincha_ketana": times.mincha_ketana,
+            "plag_hamincha": times.plag_hamincha
+        })
+    })
+
+
+def _mincha_times_markdown(params: LocationInput) -> str:
+    """Markdown body of get_mincha_times."""
+    date, times = _load_day(params)
+    return _MINCHA_TEMPLATE.substitute(
+        location=params.location,
+        date=_long_date_str(date),
+        timezone=params.time_zone,
+        chatzos=format_time(times.chatzos),
+        mincha_gedola=format_time(times.mincha_gedola),
+        mincha_ketana=format_time(times.mincha_ketana),
+        plag_hamincha=format_time(times.plag_hamincha)
     )
-    
-    tefila_gra = calendar.sof_zman_tfila_gra()
-    tefila_mga = calendar.sof_zman_tfila_mga()
-    
-    if params.response_format == ResponseFormat.JSON:
-        import json
-        return json.dumps({
-            "location": params.location,
-            "date": (date or datetime.date.today()).isoformat(),
-            "timezone": params.time_zone,
-            "sof_zman_tefila_gra": format_time_with_date(tefila_gra),
-            "sof_zman_tefila_mga": format_time_with_date(tefila_mga),
-            "sof_zman_tefila_gra_iso": tefila_gra.isoformat() if tefila_gra else None,
-            "sof_zman_tefila_mga_iso": tefila_mga.isoformat() if tefila_mga else None
-        }, indent=2)
-    
-    date_str = (date or datetime.date.today()).strftime("%B %d, %Y")
-    return f"""# Latest Times for Morning Prayer (Tefila)
-
-**Location:** {params.location}  
-**Date:** {date_str}  
-**Timezone:** {params.time_zone}
 
-## Opinions:
-
-- **GR"A (Vilna Gaon):** {format_time(tefila_gra)}
-- **MG"A (Magen Avraham):** {format_time(tefila_mga)}
 
-*Note: The MG"A time is typically earlier.*
-"""
+_MINCHA_TIMES_DISPATCH = {True: _mincha_times_json, False: _mincha_times_markdown}
 
 
 @mcp.tool(
@@ -384,55 +826,40 @@ async def get_mincha_times(params: LocationInput) -> str:
     Returns:
         str: All relevant Mincha times in the requested format
     """
-    date = None
-    if params.date:
-        date = datetime.datetime.strptime(params.date, "%Y-%m-%d").date()
-    
-    calendar = create_calendar(
-        params.location,
-        params.latitude,
-        params.longitude,
-        params.time_zone,
-        date
+    return await asyncio.to_thread(_MINCHA_TIMES_DISPATCH[params.is_json], params)
+
+
+def _shabbat_times_json(params: CandleLightingInput) -> str:
+    """JSON body of get_shabbat_times."""
+    date, times = _load_day(params, params.candle_lighting_offset)
+    return _dumps({
+        "location": params.location,
+        "date": date,
+        "timezone": params.time_zone,
+        "candle_lighting_offset_minutes": params.candle_lighting_offset,
+        **_emit({
+            "candle_lighting": times.candle_lighting,
+            "sunset": times.sunset,
+            "havdalah_tzeis_72": times.tzais_72
+        })
+    })
+
+
+def _shabbat_times_markdown(params: CandleLightingInput) -> str:
+    """Markdown body of get_shabbat_times."""
+    date, times = _load_day(params, params.candle_lighting_offset)
+    return _SHABBAT_TEMPLATE.substitute(
+        location=params.location,
+        date=_long_date_str(date),
+        timezone=params.time_zone,
+        candle_lighting=format_time(times.candle_lighting),
+        candle_lighting_offset=params.candle_lighting_offset,
+        sunset=format_time(times.sunset),
+        tzeis=format_time(times.tzais_72)  # 72 minutes after sunset for havdalah
     )
-    
-    chatzos = calendar.chatzos()
-    mincha_gedola = calendar.mincha_gedola()
-    mincha_ketana = calendar.mincha_ketana()
-    plag_hamincha = calendar.plag_hamincha()
-    
-    if params.response_format == ResponseFormat.JSON:
-        import json
-        return json.dumps({
-            "location": params.location,
-            "date": (date or datetime.date.today()).isoformat(),
-            "timezone": params.time_zone,
-            "chatzos": format_time_with_date(chatzos),
-            "mincha_gedola": format_time_with_date(mincha_gedola),
-            "mincha_ketana": format_time_with_date(mincha_ketana),
-            "plag_hamincha": format_time_with_date(plag_hamincha),
-            "chatzos_iso": chatzos.isoformat() if chatzos else None,
-            "mincha_gedola_iso": mincha_gedola.isoformat() if mincha_gedola else None,
-            "mincha_ketana_iso": mincha_ketana.isoformat() if mincha_ketana else None,
-            "plag_hamincha_iso": plag_hamincha.isoformat() if plag_hamincha else None
-        }, indent=2)
-    
-    date_str = (date or datetime.date.today()).strftime("%B %d, %Y")
-    return f"""# Mincha (Afternoon Prayer) Times
-
-**Location:** {params.location}  
-**Date:** {date_str}  
-**Timezone:** {params.time_zone}
 
-## Times:
 
-- **Chatzos (Midday):** {format_time(chatzos)}
-- **Mincha Gedola (Earliest):** {format_time(mincha_gedola)}
-- **Mincha Ketana (Preferred):** {format_time(mincha_ketana)}
-- **Plag HaMincha:** {format_time(plag_hamincha)}
-
-*Note: Mincha can be prayed from Mincha Gedola until sunset, with Mincha Ketana being the preferred earliest time.*
-"""
+_SHABBAT_TIMES_DISPATCH = {True: _shabbat_times_json, False: _shabbat_times_markdown}
 
 
 @mcp.tool(
@@ -466,57 +893,58 @@ async def get_shabbat_times(params: CandleLightingInput) -> str:
         Different communities have different customs for candle lighting time.
         Jerusalem uses 40 minutes, while many communities use 18 minutes.
     """
-    date = None
-    if params.date:
-        date = datetime.datetime.strptime(params.date, "%Y-%m-%d").date()
-    
-    calendar = create_calendar(
-        params.location,
-        params.latitude,
-        params.longitude,
-        params.time_zone,
-        date,
-        candle_lighting_offset=params.candle_lighting_offset
+    return await asyncio.to_thread(_SHABBAT_TIMES_DISPATCH[params.is_json], params)
+
+
+def _daily_times_json(params: LocationInput) -> str:
+    """JSON body of get_daily_times."""
+    date, times = _load_day(params)
+    fields = {
+        "alos_hashachar_72": times.alos_72,
+        "sunrise": times.sunrise,
+        "sof_zman_shema_gra": times.sof_zman_shma_gra,
+        "sof_zman_shema_mga": times.sof_zman_shma_mga,
+        "sof_zman_tefila_gra": times.sof_zman_tfila_gra,
+        "sof_zman_tefila_mga": times.sof_zman_tfila_mga,
+        "chatzos": times.chatzos,
+        "mincha_gedola": times.mincha_gedola,
+        "mincha_ketana": times.mincha_ketana,
+        "plag_hamincha": times.plag_hamincha,
+        "sunset": times.sunset,
+        "tzeis_hakochavim_72": times.tzais_72
+    }
+    return _dumps({
+        "location": params.location,
+        "date": date,
+        "timezone": params.time_zone,
+        "times": {name: format_time_with_date(dt) for name, dt in fields.items()},
+        "times_iso": fields
+    })
+
+
+def _daily_times_markdown(params: LocationInput) -> str:
+    """Markdown body of get_daily_times."""
+    date, times = _load_day(params)
+    return _DAILY_TEMPLATE.substitute(
+        location=params.location,
+        date=_long_date_str(date),
+        timezone=params.time_zone,
+        alos=format_time(times.alos_72),
+        sunrise=format_time(times.sunrise),
+        shema_gra=format_time(times.sof_zman_shma_gra),
+        shema_mga=format_time(times.sof_zman_shma_mga),
+        tefila_gra=format_time(times.sof_zman_tfila_gra),
+        tefila_mga=format_time(times.sof_zman_tfila_mga),
+        chatzos=format_time(times.chatzos),
+        mincha_gedola=format_time(times.mincha_gedola),
+        mincha_ketana=format_time(times.mincha_ketana),
+        plag_hamincha=format_time(times.plag_hamincha),
+        sunset=format_time(times.sunset),
+        tzeis=format_time(times.tzais_72)
     )
-    
-    candle_lighting = calendar.candle_lighting()
-    sunset = calendar.sunset()
-    tzeis = calendar.tzais_72()  # 72 minutes after sunset for havdalah
-    
-    if params.response_format == ResponseFormat.JSON:
-        import json
-        return json.dumps({
-            "location": params.location,
-            "date": (date or datetime.date.today()).isoformat(),
-            "timezone": params.time_zone,
-            "candle_lighting_offset_minutes": params.candle_lighting_offset,
-            "candle_lighting": format_time_with_date(candle_lighting),
-            "sunset": format_time_with_date(sunset),
-            "havdalah_tzeis_72": format_time_with_date(tzeis),
-            "candle_lighting_iso": candle_lighting.isoformat() if candle_lighting else None,
-            "sunset_iso": sunset.isoformat() if sunset else None,
-            "havdalah_tzeis_72_iso": tzeis.isoformat() if tzeis else None
-        }, indent=2)
-    
-    date_str = (date or datetime.date.today()).strftime("%B %d, %Y")
-    return f"""# Shabbat Times
-
-**Location:** {params.location}  
-**Date:** {date_str}  
-**Timezone:** {params.time_zone}
-
-## Friday Evening:
-
-- **Candle Lighting:** {format_time(candle_lighting)} ({params.candle_lighting_offset} minutes before sunset)
-- **Sunset (Shabbat Begins):** {format_time(sunset)}
 
-## Saturday Evening:
 
-- **Havdalah (Tzeis HaKochavim):** {format_time(tzeis)} (72 minutes after sunset)
-- **Shabbat Ends:** {format_time(tzeis)}
-
-*Note: Candle lighting customs vary by community. Jerusalem uses 40 minutes before sunset.*
-"""
+_DAILY_TIMES_DISPATCH = {True: _daily_times_json, False: _daily_times_markdown}
 
 
 @mcp.tool(
@@ -552,96 +980,7 @@ async def get_daily_times(params: LocationInput) -> str:
     Example:
         Use this tool to get a complete daily schedule of prayer times for any location.
     """
-    date = None
-    if params.date:
-        date = datetime.datetime.strptime(params.date, "%Y-%m-%d").date()
-    
-    calendar = create_calendar(
-        params.location,
-        params.latitude,
-        params.longitude,
-        params.time_zone,
-        date
-    )
-    
-    # Get all times
-    alos = calendar.alos_72()
-    sunrise = calendar.sunrise()
-    shema_gra = calendar.sof_zman_shma_gra()
-    shema_mga = calendar.sof_zman_shma_mga()
-    tefila_gra = calendar.sof_zman_tfila_gra()
-    tefila_mga = calendar.sof_zman_tfila_mga()
-    chatzos = calendar.chatzos()
-    mincha_gedola = calendar.mincha_gedola()
-    mincha_ketana = calendar.mincha_ketana()
-    plag_hamincha = calendar.plag_hamincha()
-    sunset = calendar.sunset()
-    tzeis = calendar.tzais_72()
-    
-    if params.response_format == ResponseFormat.JSON:
-        import json
-        return json.dumps({
-            "location": params.location,
-            "date": (date or datetime.date.today()).isoformat(),
-            "timezone": params.time_zone,
-            "times": {
-                "alos_hashachar_72": format_time_with_date(alos),
-                "sunrise": format_time_with_date(sunrise),
-                "sof_zman_shema_gra": format_time_with_date(shema_gra),
-                "sof_zman_shema_mga": format_time_with_date(shema_mga),
-                "sof_zman_tefila_gra": format_time_with_date(tefila_gra),
-                "sof_zman_tefila_mga": format_time_with_date(tefila_mga),
-                "chatzos": format_time_with_date(chatzos),
-                "mincha_gedola": format_time_with_date(mincha_gedola),
-                "mincha_ketana": format_time_with_date(mincha_ketana),
-                "plag_hamincha": format_time_with_date(plag_hamincha),
-                "sunset": format_time_with_date(sunset),
-                "tzeis_hakochavim_72": format_time_with_date(tzeis)
-            },
-            "times_iso": {
-                "alos_hashachar_72": alos.isoformat() if alos else None,
-                "sunrise": sunrise.isoformat() if sunrise else None,
-                "sof_zman_shema_gra": shema_gra.isoformat() if shema_gra else None,
-                "sof_zman_shema_mga": shema_mga.isoformat() if shema_mga else None,
-                "sof_zman_tefila_gra": tefila_gra.isoformat() if tefila_gra else None,
-                "sof_zman_tefila_mga": tefila_mga.isoformat() if tefila_mga else None,
-                "chatzos": chatzos.isoformat() if chatzos else None,
-                "mincha_gedola": mincha_gedola.isoformat() if mincha_gedola else None,
-                "mincha_ketana": mincha_ketana.isoformat() if mincha_ketana else None,
-                "plag_hamincha": plag_hamincha.isoformat() if plag_hamincha else None,
-                "sunset": sunset.isoformat() if sunset else None,
-                "tzeis_hakochavim_72": tzeis.isoformat() if tzeis else None
-            }
-        }, indent=2)
-    
-    date_str = (date or datetime.date.today()).strftime("%B %d, %Y")
-    return f"""# Daily Zmanim
-
-**Location:** {params.location}  
-**Date:** {date_str}  
-**Timezone:** {params.time_zone}
-
-## Morning Times:
-
-- **Alos HaShachar (Dawn):** {format_time(alos)} (72 minutes before sunrise)
-- **Sunrise:** {format_time(sunrise)}
-- **Latest Shema (GR"A):** {format_time(shema_gra)}
-- **Latest Shema (MG"A):** {format_time(shema_mga)}
-- **Latest Tefila (GR"A):** {format_time(tefila_gra)}
-- **Latest Tefila (MG"A):** {format_time(tefila_mga)}
-
-## Afternoon Times:
-
-- **Chatzos (Midday):** {format_time(chatzos)}
-- **Mincha Gedola:** {format_time(mincha_gedola)}
-- **Mincha Ketana:** {format_time(mincha_ketana)}
-- **Plag HaMincha:** {format_time(plag_hamincha)}
-
-## Evening Times:
-
-- **Sunset:** {format_time(sunset)}
-- **Tzeis HaKochavim (Nightfall):** {format_time(tzeis)} (72 minutes after sunset)
-"""
+    return await asyncio.to_thread(_DAILY_TIMES_DISPATCH[params.is_json], params)
 
 
 def main():
@@ -0,0 +1,83 @@
+"""
+Tests for the tool plumbing in zmanim_mcp.server.
+"""
+import asyncio
+import datetime
+from zoneinfo import ZoneInfo
+
+import pydantic
+import pytest
+from zmanim.util.geo_location import GeoLocation
+from zmanim.zmanim_calendar import ZmanimCalendar
+
+from zmanim_mcp import server
+
+
+@pytest.mark.parametrize("time_zone, date", [
+    ("America/New_York", datetime.date(1850, 7, 1)),   # LMT, -04:56:02
+    ("Africa/Monrovia", datetime.date(1950, 7, 1)),    # -00:44:30
+])
+def test_dumps_matches_stdlib_for_seconds_offsets(monkeypatch, time_zone, date):
+    pytest.importorskip("orjson")
+    sunrise = datetime.datetime(date.year, date.month, date.day, 6,
+                                tzinfo=server._tz(time_zone))
+    assert sunrise.utcoffset().seconds % 60
+    payload = {"location": "ירושלים", "date": date, "sunrise": sunrise, "sunset": None}
+
+    with_orjson = server._dumps(payload)
+    monkeypatch.setattr(server, "orjson", None)
+    assert server._dumps(payload) == with_orjson
+    assert sunrise.isoformat() in with_orjson
+
+
+LOCATION = {"location": "Jerusalem", "latitude": 31.7683, "longitude": 35.2137,
+            "time_zone": "Asia/Jerusalem"}
+
+
+@pytest.mark.parametrize("value", ["", "   "])
+def test_empty_date_means_today(value):
+    assert server.LocationInput(**LOCATION, date=value).date is None
+
+
+def test_empty_date_through_tool_call():
+    result = asyncio.run(server.mcp.call_tool(
+        "zmanim_get_sunrise_sunset", {"params": {**LOCATION, "date": ""}}
+    ))
+    assert "Sunrise and Sunset Times" in str(result)
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("2024-01-15", datetime.date(2024, 1, 15)),
+    (" 2024-01-15 ", datetime.date(2024, 1, 15)),
+    ("2024-1-5", datetime.date(2024, 1, 5)),
+    (datetime.date(2024, 1, 15), datetime.date(2024, 1, 15)),
+])
+def test_date_accepts_yyyy_mm_dd(value, expected):
+    assert server.LocationInput(**LOCATION, date=value).date == expected
+
+
+@pytest.mark.parametrize("value", [
+    "2024-01-01T00:00", "2024-02-30", "01/15/2024", 20240115,
+    datetime.datetime(2024, 1, 15),
+])
+def test_date_rejects_other_formats(value):
+    with pytest.raises(pydantic.ValidationError):
+        server.LocationInput(**LOCATION, date=value)
+
+
+def test_dates_after_2037_follow_zoneinfo_dst():
+    # zmanim's dateutil time zones stop applying DST after 2037; ours do not
+    date = datetime.date(2050, 7, 1)
+    times = server.compute_day_bundle(
+        server.create_calendar("New York", 40.7128, -74.0060, "America/New_York", date)
+    )
+    assert times.sunrise.utcoffset() == datetime.timedelta(hours=-4)
+    assert times.sunrise.utcoffset() == ZoneInfo("America/New_York").utcoffset(
+        times.sunrise.replace(tzinfo=None)
+    )
+
+    reference = ZmanimCalendar(
+        geo_location=GeoLocation("New York", 40.7128, -74.0060, "America/New_York"),
+        date=date,
+    ).sunrise()
+    assert abs(times.sunrise - reference) < datetime.timedelta(milliseconds=1)
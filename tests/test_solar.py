@@ -0,0 +1,144 @@
+"""
+Tests for the sunrise/sunset kernels behind compute_day_bundle.
+
+Every zman from the NOAA kernel is compared against the matching
+ZmanimCalendar accessor, and the opt-in Spencer kernel against NOAA, with
+Numba (when installed) and as plain Python.
+"""
+import dataclasses
+import datetime
+import importlib
+import math
+import random
+import sys
+
+import pytest
+from zmanim.util.geo_location import GeoLocation
+from zmanim.zmanim_calendar import ZmanimCalendar
+
+from zmanim_mcp import _solar, server
+from zmanim_mcp.server import ZmanimBundle, compute_day_bundle, create_calendar
+
+# The kernel is the same float arithmetic as zmanim's NOAACalculator; the
+# remaining difference is datetime rounding to whole microseconds
+TOLERANCE = datetime.timedelta(milliseconds=1)
+
+MID_LATITUDE_ZONES = [
+    "America/New_York", "America/Los_Angeles", "America/Argentina/Buenos_Aires",
+    "Europe/London", "Asia/Jerusalem", "Africa/Johannesburg", "Asia/Tokyo",
+    "Australia/Sydney", "UTC",
+]
+POLAR_ZONES = [
+    "Europe/Oslo", "Arctic/Longyearbyen", "America/Anchorage", "America/Nuuk",
+    "Antarctica/McMurdo", "Atlantic/Reykjavik",
+]
+ANTIMERIDIAN_ZONES = [
+    "Pacific/Auckland", "Pacific/Chatham", "Pacific/Kiritimati", "Pacific/Tongatapu",
+    "Pacific/Fiji", "Pacific/Honolulu", "Pacific/Pago_Pago", "Asia/Kamchatka",
+    "America/Adak",
+]
+
+
+def _random_date(rng: random.Random) -> datetime.date:
+    # dateutil, which zmanim uses for time zones, only knows DST transitions
+    # listed in the zone file (through 2037), while zoneinfo keeps applying
+    # the zone's rule after that, so later dates differ by an hour in summer
+    first, last = datetime.date(1990, 1, 1), datetime.date(2037, 12, 31)
+    return first + datetime.timedelta(days=rng.randrange((last - first).days + 1))
+
+
+def _cases():
+    rng = random.Random(5784)
+    cases = []
+    for _ in range(150):
+        cases.append(("mid-latitude", rng.uniform(-60, 60), rng.uniform(-180, 180),
+                      rng.choice(MID_LATITUDE_ZONES), _random_date(rng)))
+    for _ in range(100):
+        latitude = rng.uniform(66.6, 80) * rng.choice((-1, 1))
+        cases.append(("polar", latitude, rng.uniform(-180, 180),
+                      rng.choice(POLAR_ZONES), _random_date(rng)))
+    for _ in range(100):
+        longitude = rng.uniform(170, 180) * rng.choice((-1, 1))
+        cases.append(("antimeridian", rng.uniform(-60, 60), longitude,
+                      rng.choice(ANTIMERIDIAN_ZONES), _random_date(rng)))
+    return cases
+
+
+CASES = _cases()
+
+
+@pytest.fixture(scope="module", params=["numba", "python"])
+def kernel(request):
+    """Run the module's tests once per kernel build."""
+    if request.param == "numba":
+        pytest.importorskip("numba")
+        yield request.param
+        return
+
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setitem(sys.modules, "numba", None)
+        importlib.reload(_solar)
+        assert not hasattr(_solar.sun_rise_set_utc, "py_func")
+        yield request.param
+    importlib.reload(_solar)
+
+
+@pytest.mark.parametrize(
+    "region, latitude, longitude, time_zone, date",
+    CASES,
+    ids=[f"{case[0]}-{i}" for i, case in enumerate(CASES)],
+)
+def test_bundle_matches_zmanim(kernel, region, latitude, longitude, time_zone, date):
+    bundle = compute_day_bundle(create_calendar(region, latitude, longitude, time_zone, date))
+    reference = ZmanimCalendar(
+        geo_location=GeoLocation(region, latitude, longitude, time_zone),
+        date=date,
+    )
+
+    for field in dataclasses.fields(ZmanimBundle):
+        actual = getattr(bundle, field.name)
+        expected = getattr(reference, field.name)()
+        if expected is None:
+            assert actual is None, field.name
+            continue
+        assert actual is not None, field.name
+        assert abs(actual - expected) <= TOLERANCE, field.name
+        assert actual.utcoffset() == expected.utcoffset(), field.name
+
+
+@pytest.mark.parametrize("fast_solar", [False, True], ids=["noaa", "spencer"])
+@pytest.mark.parametrize("date", [datetime.date(2024, 6, 21), datetime.date(2024, 12, 21)])
+def test_polar_day_has_no_sunrise_or_sunset(kernel, monkeypatch, fast_solar, date):
+    monkeypatch.setattr(server, "_FAST_SOLAR", fast_solar)
+    bundle = compute_day_bundle(create_calendar("Tromso", 69.65, 18.96, "Europe/Oslo", date))
+    assert bundle.sunrise is None
+    assert bundle.sunset is None
+    assert bundle.chatzos is None
+
+
+def test_spencer_kernel_returns_nan_without_sunrise(kernel):
+    jd = _solar.julian_day(2024, 12, 21)
+    sunrise, sunset = _solar.ephemeris_sun_rise_set_utc(jd, 69.65, 18.96, server.SEA_LEVEL_ZENITH)
+    assert math.isnan(sunrise)
+    assert math.isnan(sunset)
+
+
+# Documented accuracy of the Spencer kernel against NOAA, by |latitude|
+@pytest.mark.parametrize("min_latitude, max_latitude, limit", [
+    (0, 50, datetime.timedelta(minutes=1.1)),
+    (50, 60, datetime.timedelta(minutes=1.5)),
+])
+def test_spencer_kernel_within_documented_error(kernel, monkeypatch, min_latitude, max_latitude, limit):
+    rng = random.Random(5784)
+    for _ in range(500):
+        latitude = rng.uniform(min_latitude, max_latitude) * rng.choice((-1, 1))
+        calendar = create_calendar("Spencer", latitude, rng.uniform(-180, 180),
+                                   rng.choice(MID_LATITUDE_ZONES), _random_date(rng))
+
+        monkeypatch.setattr(server, "_FAST_SOLAR", False)
+        expected = compute_day_bundle(calendar)
+        monkeypatch.setattr(server, "_FAST_SOLAR", True)
+        actual = compute_day_bundle(calendar)
+
+        for name in ("sunrise", "sunset"):
+            assert abs(getattr(actual, name) - getattr(expected, name)) <= limit, (name, calendar.geo_location)